@@ -1,6 +1,18 @@
+import importlib
+
 from .base import AIModel
-from .deepseek_model import DeepSeekModel
-from .openrouter_model import OpenRouterModel
 from .factory import AIModelFactory
+from .registry import ModelRegistry
+
+# Backends are imported on first access so importing the package stays cheap
+_lazy_models = {
+    'DeepSeekModel': '.deepseek_model',
+    'OpenRouterModel': '.openrouter_model',
+}
+
+def __getattr__(name):
+    if name in _lazy_models:
+        return getattr(importlib.import_module(_lazy_models[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ['AIModel', 'DeepSeekModel', 'OpenRouterModel', 'AIModelFactory']
+__all__ = ['AIModel', 'DeepSeekModel', 'OpenRouterModel', 'AIModelFactory', 'ModelRegistry']
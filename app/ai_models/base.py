@@ -1,7 +1,16 @@
+import os
+import logging
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import aiohttp
 
 class AIModel(ABC):
+    # Provider endpoint, used to pre-open a connection during warm-up
+    api_url: Optional[str] = None
+    _session: Optional["aiohttp.ClientSession"] = None
+
     @abstractmethod
     async def generate_response(
         self,
@@ -23,3 +32,29 @@ class AIModel(ABC):
             str: The generated response
         """
         pass
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Get the shared HTTP session, creating it if needed so connections are reused across requests."""
+        if self._session is None or self._session.closed:
+            import aiohttp
+            # Completions take seconds each, so don't cap concurrent connections by default (0 = no limit).
+            # Each request is limited to 30s overall, including any wait for a free connection when capped
+            connector = aiohttp.TCPConnector(limit=int(os.getenv('AI_MODEL_MAX_CONNECTIONS', 0)))
+            timeout = aiohttp.ClientTimeout(total=30, sock_connect=10)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def warm_up(self) -> None:
+        """Open the HTTP session and establish a pooled connection to the provider."""
+        if not self.api_url:
+            return
+        try:
+            async with self._get_session().head(self.api_url) as response:
+                await response.release()
+        except Exception as e:
+            logging.warning(f"Warm-up request to {self.api_url} failed: {str(e)}")
+
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
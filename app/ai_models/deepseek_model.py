@@ -3,8 +3,11 @@ import logging
 import aiohttp
 from typing import Dict, List, Optional
 from .base import AIModel
+from ..session_log import record_api_request
 
 class DeepSeekModel(AIModel):
+    api_url = "https://api.deepseek.com/v1/chat/completions"
+
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv('DEEPSEEK_API_KEY')
         if not self.api_key:
@@ -39,9 +42,9 @@ class DeepSeekModel(AIModel):
 
         # Make API request
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
-                response = await self._make_api_request(session, messages)
-                return response
+            session = self._get_session()
+            response = await self._make_api_request(session, messages)
+            return response
         except Exception as e:
             logging.error(f"Error generating response: {str(e)}")
             return "I apologize, but I'm having trouble processing your request at the moment. Please try again."
@@ -66,6 +69,7 @@ Character Stats:
 
 Consider these stats when suggesting ability checks, saving throws, and determining the success of actions. Address the character by name and consider their racial traits, class abilities, and background story elements in your responses."""
 
+    @record_api_request
     async def _make_api_request(self, session: aiohttp.ClientSession, messages: List[Dict]) -> str:
         headers = {
             "Content-Type": "application/json",
@@ -73,7 +77,7 @@ Consider these stats when suggesting ability checks, saving throws, and determin
         }
 
         async with session.post(
-            "https://api.deepseek.com/v1/chat/completions",
+            self.api_url,
             json={
                 "model": "deepseek-chat",
                 "messages": messages,
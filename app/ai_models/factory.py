@@ -1,14 +1,14 @@
-from typing import Optional, Dict
+import importlib
+from typing import Optional, Dict, Union
 from .base import AIModel
-from .deepseek_model import DeepSeekModel
-from .openrouter_model import OpenRouterModel
 
 class AIModelFactory:
-    _models: Dict[str, type] = {
-        "deepseek": DeepSeekModel,
-        "openrouter": OpenRouterModel,
+    # Backends are referenced as "module:Class" and imported on first use
+    _models: Dict[str, Union[str, type]] = {
+        "deepseek": ".deepseek_model:DeepSeekModel",
+        "openrouter": ".openrouter_model:OpenRouterModel",
         # Add more models here as they become available
-        # "anthropic": AnthropicModel,
+        # "anthropic": ".anthropic_model:AnthropicModel",
     }
 
     @classmethod
@@ -27,22 +27,44 @@ class AIModelFactory:
         Raises:
             ValueError: If the specified model is not supported
         """
-        model_class = cls._models.get(model_name.lower())
-        if not model_class:
-            raise ValueError(f"Unsupported model: {model_name}. Available models: {list(cls._models.keys())}")
+        model_class = cls.get_model_class(model_name)
         
         if model_options:
             return model_class(api_key=api_key, **model_options)
         return model_class(api_key=api_key)
 
     @classmethod
-    def register_model(cls, name: str, model_class: type) -> None:
+    def get_model_class(cls, model_name: str) -> type:
+        """
+        Resolve a model name to its class, importing the backend module if needed.
+        
+        Args:
+            model_name: Name of the model
+            
+        Returns:
+            type: The model class
+            
+        Raises:
+            ValueError: If the specified model is not supported
+        """
+        model_class = cls._models.get(model_name.lower())
+        if not model_class:
+            raise ValueError(f"Unsupported model: {model_name}. Available models: {list(cls._models.keys())}")
+
+        if isinstance(model_class, str):
+            module_path, class_name = model_class.split(":")
+            module = importlib.import_module(module_path, __package__)
+            model_class = cls._models[model_name.lower()] = getattr(module, class_name)
+        return model_class
+
+    @classmethod
+    def register_model(cls, name: str, model_class: Union[str, type]) -> None:
         """
         Register a new model type.
         
         Args:
             name: Name of the model
-            model_class: The model class to register
+            model_class: The model class to register, or a "module:Class" path to import lazily
         """
         cls._models[name.lower()] = model_class
 
@@ -4,8 +4,11 @@ import aiohttp
 import re
 from typing import Dict, List, Optional
 from .base import AIModel
+from ..session_log import record_api_request
 
 class OpenRouterModel(AIModel):
+    api_url = "https://openrouter.ai/api/v1/chat/completions"
+
     def __init__(self, api_key: Optional[str] = None, model_name: Optional[str] = None):
         """
         Initialize OpenRouter model.
@@ -64,11 +67,11 @@ class OpenRouterModel(AIModel):
 
         # Make API request
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
-                response = await self._make_api_request(session, messages)
-                # Post-process the response to ensure proper formatting
-                formatted_response = self._ensure_formatting(response)
-                return formatted_response
+            session = self._get_session()
+            response = await self._make_api_request(session, messages)
+            # Post-process the response to ensure proper formatting
+            formatted_response = self._ensure_formatting(response)
+            return formatted_response
         except Exception as e:
             logging.error(f"Error generating response: {str(e)}")
             return "I apologize, but I'm having trouble processing your request at the moment. Please try again."
@@ -143,6 +146,7 @@ Character Stats:
 
 Consider these stats when suggesting ability checks, saving throws, and determining the success of actions. Address the character by name and consider their racial traits, class abilities, and background story elements in your responses."""
 
+    @record_api_request
     async def _make_api_request(self, session: aiohttp.ClientSession, messages: List[Dict]) -> str:
         headers = {
             "Content-Type": "application/json",
@@ -152,7 +156,7 @@ Consider these stats when suggesting ability checks, saving throws, and determin
         }
 
         async with session.post(
-            "https://openrouter.ai/api/v1/chat/completions",
+            self.api_url,
             json={
                 "model": self.model_name,
                 "messages": messages,
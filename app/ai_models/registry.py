@@ -0,0 +1,43 @@
+import os
+import logging
+from typing import Dict, Optional
+from .base import AIModel
+from .factory import AIModelFactory
+
+class ModelRegistry:
+    """Holds the active AI model, constructing it on first use."""
+
+    def __init__(self, model_name: Optional[str] = None, model_options: Optional[Dict] = None):
+        """
+        Initialize the registry without constructing the model.
+        
+        Args:
+            model_name: Name of the model to use. If not provided, will look for AI_MODEL env var
+                      when the model is first requested, then fall back to deepseek
+            model_options: Optional additional configuration for the model
+        """
+        self.model_name = model_name
+        self.model_options = model_options
+        self._model: Optional[AIModel] = None
+
+    def get(self) -> AIModel:
+        """
+        Get the active model, constructing it on first call.
+        
+        Raises:
+            ValueError: If the model is not supported or its API key is missing
+        """
+        if self._model is None:
+            model_name = self.model_name or os.getenv('AI_MODEL', 'deepseek')
+            self._model = AIModelFactory.create_model(model_name, model_options=self.model_options)
+            logging.info(f"Initialized AI model: {model_name}")
+        return self._model
+
+    async def warm_up(self) -> None:
+        """Construct the model and pre-open its provider connection."""
+        await self.get().warm_up()
+
+    async def close(self) -> None:
+        """Close the model's provider connections, if it was constructed."""
+        if self._model is not None:
+            await self._model.close()
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Dict, Optional
+
+# Upper bounds (ms) of the scheduling delay histogram buckets
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class LoopLagMonitor:
+    """
+    Measure event loop scheduling delay and capture stacks when the loop stalls.
+
+    A coroutine sleeps for a fixed interval and records how late it wakes up.
+    A watchdog thread checks the coroutine's heartbeat, so a stall is reported
+    with a stack snapshot of the loop thread while it is still blocked.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25, window: int = 1000):
+        self.interval = interval
+        self.threshold = threshold
+        self.samples = 0
+        self.stalls = 0
+        self.max_lag = 0.0
+        self._total_lag = 0.0
+        self._histogram = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self._recent = deque(maxlen=window)
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval * 2)
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._record(max(0.0, now - expected))
+            self._heartbeat = now
+
+    def _record(self, lag: float) -> None:
+        self.samples += 1
+        self._total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        self._recent.append(lag)
+        lag_ms = lag * 1000
+        for index, bound in enumerate(LAG_BUCKETS_MS):
+            if lag_ms <= bound:
+                self._histogram[index] += 1
+                break
+        else:
+            self._histogram[-1] += 1
+
+    def _watch(self) -> None:
+        reported = None
+        while not self._stop.wait(self.interval):
+            heartbeat = self._heartbeat
+            stalled_for = time.monotonic() - heartbeat - self.interval
+            if stalled_for < self.threshold or reported == heartbeat:
+                continue
+
+            # Report each stall once, while the loop thread is still blocked
+            reported = heartbeat
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<no frame>\n"
+            logging.warning(f"Event loop blocked for {stalled_for * 1000:.0f}ms, loop thread stack:\n{stack}")
+
+    def stats(self) -> Dict:
+        """Get the scheduling delay distribution."""
+        recent = sorted(self._recent)
+
+        def percentile(p: float) -> float:
+            if not recent:
+                return 0.0
+            return round(recent[min(len(recent) - 1, int(len(recent) * p))] * 1000, 3)
+
+        labels = [f"<={bound}ms" for bound in LAG_BUCKETS_MS] + [f">{LAG_BUCKETS_MS[-1]}ms"]
+        return {
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "samples": self.samples,
+            "stalls": self.stalls,
+            "mean_ms": round(self._total_lag / self.samples * 1000, 3) if self.samples else 0.0,
+            "max_ms": round(self.max_lag * 1000, 3),
+            "p50_ms": percentile(0.5),
+            "p99_ms": percentile(0.99),
+            "histogram": dict(zip(labels, self._histogram))
+        }
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{frame.f_lineno})"
+
+
+def sample_stacks(duration: float, interval: float = 0.005) -> str:
+    """
+    Sample the stacks of all other threads for a fixed duration.
+
+    Blocks the calling thread, so run it outside the event loop.
+
+    Args:
+        duration: Seconds to sample for
+        interval: Seconds between samples
+
+    Returns:
+        str: Collapsed stacks ("thread;outer;...;inner count" per line), as
+            consumed by flamegraph.pl and speedscope
+    """
+    own_id = threading.get_ident()
+    counts: Counter = Counter()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}"))
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
@@ -1,32 +1,58 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import Depends, FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, List
+from fastapi.responses import PlainTextResponse
+from typing import Dict, List, Optional
+from contextlib import asynccontextmanager
 import json
 import os
-import aiohttp
 import asyncio
 import logging
 import re
+import secrets
 from dotenv import load_dotenv
 from pathlib import Path
 from datetime import datetime
 
-# Add project root to Python path
-import sys
-sys.path.append(str(Path(__file__).resolve().parent.parent))
+# Add project root to Python path when loaded outside the app package (e.g. `python main.py`)
+if not __package__:
+    import sys
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from app.ai_models import AIModelFactory
+from app.ai_models import ModelRegistry
+from app.diagnostics import LoopLagMonitor, sample_stacks
+from app.session_log import current_event_log, open_session_log
 
-# Load environment variables
-load_dotenv()
+# AI model is constructed on first use, or during startup when warm-up is enabled
+model_registry = ModelRegistry()
 
-# Initialize AI model
-ai_model = AIModelFactory.create_model(os.getenv('AI_MODEL', 'deepseek'))
+loop_lag_monitor = LoopLagMonitor()
+
+# Only one sampling profile may run at a time
+profile_lock = asyncio.Lock()
 
 # Get the current directory
 BASE_DIR = Path(__file__).resolve().parent
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load environment variables
+    load_dotenv()
+
+    # Track event loop scheduling delay and log stacks when it stalls
+    loop_lag_monitor.threshold = float(os.getenv('LOOP_LAG_THRESHOLD_MS', 250)) / 1000
+    loop_lag_monitor.start()
+
+    try:
+        # Optionally construct the model and pre-open provider connections before serving
+        if os.getenv('MODEL_WARM_UP', 'false').lower() in ('1', 'true', 'yes'):
+            await model_registry.warm_up()
+
+        yield
+    finally:
+        await loop_lag_monitor.stop()
+        await model_registry.close()
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -147,7 +173,7 @@ Remember: Every location must use #tags#, every character must use @tags@, all d
         # Notify all clients that GM is typing
         await manager.broadcast_typing_status(True)
         
-        response = await ai_model.generate_response(
+        response = await model_registry.get().generate_response(
             message=message,
             system_prompt=system_prompt,
             character=character,
@@ -185,9 +211,46 @@ async def get_server_info():
         "model": model_details
     }
 
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Allow access only with the ADMIN_TOKEN; admin endpoints are hidden when it is unset."""
+    admin_token = os.getenv('ADMIN_TOKEN')
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token.encode(), admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/admin/loop-lag", dependencies=[Depends(require_admin)])
+async def get_loop_lag():
+    """Get the event loop scheduling delay distribution."""
+    return loop_lag_monitor.stats()
+
+@app.get("/admin/profile", dependencies=[Depends(require_admin)])
+async def get_profile(seconds: float = 10.0, interval_ms: float = 5.0):
+    """Sample the live process for a few seconds and return collapsed stacks for flamegraph tools."""
+    if not 0 < seconds <= 60:
+        raise HTTPException(status_code=400, detail="seconds must be between 0 and 60")
+    if not 1 <= interval_ms <= 1000:
+        raise HTTPException(status_code=400, detail="interval_ms must be between 1 and 1000")
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    async with profile_lock:
+        # Sample from a worker thread so the event loop keeps serving (and is profiled) meanwhile
+        loop = asyncio.get_running_loop()
+        collapsed = await loop.run_in_executor(None, sample_stacks, seconds, interval_ms / 1000)
+
+    filename = f"profile-{datetime.now().strftime('%Y%m%dT%H%M%S')}.collapsed"
+    return PlainTextResponse(collapsed, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()  # Accept the connection here
+
+    # Record this session's traffic when SESSION_LOG_DIR is set
+    event_log = open_session_log()
+    if event_log:
+        websocket = event_log.record_websocket(websocket)
+        current_event_log.set(event_log)
     
     try:
         player_id = None
@@ -342,7 +405,24 @@ async def websocket_endpoint(websocket: WebSocket):
             })
         except:
             pass
+    finally:
+        if event_log:
+            event_log.close()
 
 if __name__ == "__main__":
+    import argparse
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+
+    parser = argparse.ArgumentParser(description="Run the D&D AI Game Master API server.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--production", action="store_true",
+                        help="Run without the auto-reloader and warm up the AI model before serving")
+    args = parser.parse_args()
+
+    if args.production:
+        os.environ.setdefault('MODEL_WARM_UP', 'true')
+        # Single process only: game state lives in memory in this process
+        uvicorn.run("main:app", host=args.host, port=args.port)
+    else:
+        uvicorn.run("main:app", host=args.host, port=args.port, reload=True)
\ No newline at end of file
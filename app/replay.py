@@ -0,0 +1,192 @@
+"""
+Replay recorded session logs against the websocket server with a mock model.
+
+Each recorded session is re-driven over a real websocket connection, pacing
+client messages by their recorded offsets. Model calls are answered from the
+recorded responses after the recorded latency, so formatting and broadcast
+costs can be profiled offline on real traffic shapes.
+
+Usage:
+    python -m app.replay logs/sessions [--speed 2.0]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Dict, List
+
+if not __package__:
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.session_log import read_session_log
+
+FALLBACK_RESPONSE = "I apologize, but I'm having trouble processing your request at the moment. Please try again."
+
+
+class RecordedResponses:
+    """Recorded model responses keyed by the final message of each request."""
+
+    def __init__(self, sessions: List[List[Dict]], speed: float = 1.0):
+        self.speed = speed
+        self.misses = 0
+        self._responses: Dict[str, deque] = defaultdict(deque)
+        for events in sessions:
+            request = None
+            for event in events:
+                if event["event"] == "model_request":
+                    request = event["message"]
+                elif event["event"] == "model_response" and request is not None:
+                    self._responses[request].append((event["response"], event["duration"]))
+                    request = None
+
+    async def make_api_request(self, session, messages: List[Dict]) -> str:
+        recorded = self._responses.get(messages[-1]["content"])
+        if not recorded:
+            self.misses += 1
+            return FALLBACK_RESPONSE
+        response, duration = recorded.popleft()
+        await asyncio.sleep(duration / self.speed)
+        return response
+
+
+def load_sessions(log_dir: Path) -> List[List[Dict]]:
+    return [read_session_log(path) for path in sorted(log_dir.glob("*.jsonl"))]
+
+
+def build_turns(events: List[Dict]) -> List[Dict]:
+    """
+    Group each client message with the number of direct replies it received.
+
+    Turns recorded before the session's character was created are skipped, as
+    happens when rotation has dropped the head of a long session; the server
+    would not answer them for a player it does not know.
+    """
+    turns = []
+    turn = None
+    character_created = False
+    for event in events:
+        if event["event"] == "ws_in":
+            data = event["data"]
+            if data.get("type") == "character_created":
+                character_created = True
+            if not character_created and data.get("type") in ("action", "end_game"):
+                turn = None
+                continue
+            turn = {"t": event["t"], "data": data, "replies": 0}
+            turns.append(turn)
+        elif event["event"] == "ws_out" and turn and event["data"].get("type") != "gm_typing":
+            turn["replies"] += 1
+    return turns
+
+
+async def replay_session(url: str, turns: List[Dict], speed: float, timeout: float) -> List[float]:
+    import websockets
+
+    latencies = []
+    started = time.monotonic()
+    # Pace from the first replayed turn, which is later than session start if the head was rotated away
+    offset = turns[0]["t"] if turns else 0.0
+    async with websockets.connect(url) as websocket:
+        for turn in turns:
+            delay = (turn["t"] - offset) / speed - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            sent = time.perf_counter()
+            await websocket.send(json.dumps(turn["data"]))
+            received = 0
+            while received < turn["replies"]:
+                message = json.loads(await asyncio.wait_for(websocket.recv(), timeout))
+                if message.get("type") != "gm_typing":
+                    received += 1
+            if turn["replies"]:
+                latencies.append(time.perf_counter() - sent)
+    return latencies
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_replay(log_dir: Path, speed: float, timeout: float) -> None:
+    import uvicorn
+
+    sessions = load_sessions(log_dir)
+    if not sessions:
+        raise SystemExit(f"No session logs found in {log_dir}")
+
+    # Never record the replay itself, and let the backend construct without real credentials
+    # (an empty value disables logging and is not overridden by .env)
+    os.environ['SESSION_LOG_DIR'] = ''
+    os.environ['MODEL_WARM_UP'] = 'false'
+    os.environ.setdefault('DEEPSEEK_API_KEY', 'replay')
+    os.environ.setdefault('OPENROUTER_API_KEY', 'replay')
+
+    # The model is built before the server lifespan runs, so load .env settings now
+    from dotenv import load_dotenv
+    load_dotenv()
+    from app import main
+
+    # Replay through the backend that served the recorded traffic
+    recorded_model = sessions[0][0].get("model") if sessions[0] else None
+    if recorded_model:
+        main.model_registry.model_name = recorded_model
+
+    recorded = RecordedResponses(sessions, speed)
+    main.model_registry.get()._make_api_request = recorded.make_api_request
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(
+            replay_session(f"ws://127.0.0.1:{port}/ws", build_turns(events), speed, timeout)
+            for events in sessions
+        ), return_exceptions=True)
+    finally:
+        server.should_exit = True
+        await serve_task
+    elapsed = time.perf_counter() - started
+
+    latencies = []
+    failures = 0
+    for result in results:
+        if isinstance(result, Exception):
+            failures += 1
+            print(f"Session failed: {result!r}")
+        else:
+            latencies.extend(result)
+
+    print(f"Replayed {len(sessions)} sessions ({failures} failed) in {elapsed:.2f}s at {speed}x speed")
+    print(f"Turns: {len(latencies)}, unmatched model requests: {recorded.misses}")
+    if latencies:
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"Turn latency: mean {statistics.mean(latencies) * 1000:.1f}ms, "
+              f"p50 {statistics.median(latencies) * 1000:.1f}ms, p95 {p95 * 1000:.1f}ms, "
+              f"max {latencies[-1] * 1000:.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded session logs against a mock model.")
+    parser.add_argument("log_dir", type=Path, help="Directory containing session logs (SESSION_LOG_DIR)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Time compression factor (2.0 replays twice as fast)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for each server reply")
+    args = parser.parse_args()
+    asyncio.run(run_replay(args.log_dir, args.speed, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import atexit
+import contextvars
+import functools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Session log of the websocket connection handled by the current task
+current_event_log: contextvars.ContextVar = contextvars.ContextVar("current_event_log", default=None)
+
+_CLOSE = object()
+
+
+class _EventWriter:
+    """Background thread that serializes events and appends them to rotating JSONL files."""
+
+    def __init__(self, log_dir: Path, max_bytes: int, backup_count: int):
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._files: Dict[str, object] = {}
+        # Sessions whose close marker was handled; late events for them are dropped
+        self._closed: set = set()
+        self._thread = threading.Thread(target=self._run, name="session-log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, session_id: str, event) -> None:
+        self._queue.put((session_id, event))
+
+    def stop(self) -> None:
+        self._queue.put((None, _CLOSE))
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while True:
+            session_id, event = self._queue.get()
+            if session_id is None:
+                break
+            try:
+                if session_id in self._closed:
+                    continue
+                if event is _CLOSE:
+                    self._closed.add(session_id)
+                    self._close(session_id)
+                else:
+                    self._write(session_id, json.dumps(event, separators=(",", ":"), default=str) + "\n")
+            except Exception as e:
+                logging.error(f"Error writing session log {session_id}: {str(e)}")
+        for session_id in list(self._files):
+            self._close(session_id)
+
+    def _write(self, session_id: str, line: str) -> None:
+        data = line.encode("utf-8")
+        handle = self._files.get(session_id)
+        if handle is None:
+            handle = self._files[session_id] = open(self.log_dir / f"{session_id}.jsonl", "ab")
+        if self.max_bytes and handle.tell() and handle.tell() + len(data) > self.max_bytes:
+            handle = self._rotate(session_id)
+        handle.write(data)
+        handle.flush()
+
+    def _rotate(self, session_id: str) -> object:
+        self._files.pop(session_id).close()
+        base = self.log_dir / f"{session_id}.jsonl"
+        for index in range(self.backup_count - 1, 0, -1):
+            source = base.with_name(f"{base.name}.{index}")
+            if source.exists():
+                source.replace(base.with_name(f"{base.name}.{index + 1}"))
+        if self.backup_count > 0:
+            base.replace(base.with_name(f"{base.name}.1"))
+        else:
+            base.unlink()
+        handle = self._files[session_id] = open(base, "ab")
+        return handle
+
+    def _close(self, session_id: str) -> None:
+        handle = self._files.pop(session_id, None)
+        if handle is not None:
+            handle.close()
+
+
+_writer: Optional[_EventWriter] = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer(log_dir: Path) -> _EventWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            log_dir.mkdir(parents=True, exist_ok=True)
+            _writer = _EventWriter(
+                log_dir,
+                max_bytes=int(os.getenv('SESSION_LOG_MAX_BYTES', 5 * 1024 * 1024)),
+                backup_count=int(os.getenv('SESSION_LOG_BACKUPS', 3))
+            )
+            atexit.register(_writer.stop)
+        return _writer
+
+
+class SessionEventLog:
+    """
+    Append-only event log for a single websocket session.
+
+    Events are handed to a background writer thread, so recording never blocks
+    the event loop. Recorded payloads are serialized later and must not be
+    mutated after they are passed in.
+    """
+
+    def __init__(self, writer: _EventWriter, session_id: str):
+        self.session_id = session_id
+        self._writer = writer
+        self._started = time.monotonic()
+        self._seq = 0
+        self._closed = False
+
+    def record(self, event: str, **payload) -> None:
+        # The connection may still receive broadcasts after its session ended
+        if self._closed:
+            return
+        self._seq += 1
+        self._writer.put(self.session_id, {
+            "seq": self._seq,
+            "t": round(time.monotonic() - self._started, 6),
+            "event": event,
+            **payload
+        })
+
+    def record_websocket(self, websocket) -> "RecordingWebSocket":
+        return RecordingWebSocket(websocket, self)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.record("session_end")
+        self._closed = True
+        self._writer.put(self.session_id, _CLOSE)
+
+
+class RecordingWebSocket:
+    """Websocket proxy that records every JSON message received and sent."""
+
+    def __init__(self, websocket, event_log: SessionEventLog):
+        self._websocket = websocket
+        self._event_log = event_log
+
+    async def receive_json(self, *args, **kwargs):
+        data = await self._websocket.receive_json(*args, **kwargs)
+        self._event_log.record("ws_in", data=data)
+        return data
+
+    async def send_json(self, data, *args, **kwargs):
+        # Record only delivered messages, since replay waits for each recorded reply
+        await self._websocket.send_json(data, *args, **kwargs)
+        self._event_log.record("ws_out", data=data)
+
+    def __getattr__(self, name):
+        return getattr(self._websocket, name)
+
+
+def open_session_log() -> Optional[SessionEventLog]:
+    """
+    Start a new session log if SESSION_LOG_DIR is configured.
+
+    Returns:
+        SessionEventLog or None when session logging is disabled
+    """
+    log_dir = os.getenv('SESSION_LOG_DIR')
+    if not log_dir:
+        return None
+
+    session_id = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    event_log = SessionEventLog(_get_writer(Path(log_dir)), session_id)
+    event_log.record(
+        "session_start",
+        started_at=datetime.now().isoformat(),
+        model=os.getenv('AI_MODEL', 'deepseek')
+    )
+    return event_log
+
+
+def record_api_request(func):
+    """
+    Record the response of a model's ``_make_api_request`` call.
+
+    Only the final message is stored; the prompts are static and the history
+    is already in the ``ws_out`` events, so logging every message would bloat
+    the log on each turn.
+    """
+    @functools.wraps(func)
+    async def wrapper(self, session, messages: List[Dict]) -> str:
+        event_log = current_event_log.get()
+        if event_log is None:
+            return await func(self, session, messages)
+
+        event_log.record("model_request", message=messages[-1]["content"], message_count=len(messages))
+        started = time.perf_counter()
+        response = await func(self, session, messages)
+        event_log.record("model_response", response=response, duration=round(time.perf_counter() - started, 6))
+        return response
+    return wrapper
+
+
+def read_session_log(path: Path) -> List[Dict]:
+    """Read a session log, including any rotated segments, in recording order."""
+    segments = sorted(
+        (p for p in path.parent.glob(f"{path.name}.*") if p.suffix[1:].isdigit()),
+        key=lambda p: int(p.suffix[1:]),
+        reverse=True
+    )
+    events = []
+    for segment in [*segments, path]:
+        if not segment.exists():
+            continue
+        with open(segment, encoding="utf-8") as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+    return events
@@ -0,0 +1,61 @@
+"""
+Measure cold start time of the API server.
+
+Each run starts a fresh interpreter, imports ``app.main`` and drives the
+application lifespan to the point where it would accept connections.
+Reported times are medians over all runs.
+
+Usage:
+    python benchmarks/startup.py [--runs 10] [--warm-up]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+from app import main
+imported = time.perf_counter()
+
+async def start():
+    async with main.app.router.lifespan_context(main.app):
+        return time.perf_counter()
+
+ready = asyncio.run(start())
+print(json.dumps({"import": imported - started, "ready": ready - started}))
+"""
+
+
+def run_once(warm_up: bool) -> dict:
+    env = dict(os.environ, MODEL_WARM_UP='true' if warm_up else 'false')
+    env.pop('SESSION_LOG_DIR', None)
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure API server cold start time.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--warm-up", action="store_true", help="Include model construction and connection warm-up")
+    args = parser.parse_args()
+
+    samples = [run_once(args.warm_up) for _ in range(args.runs)]
+    import_ms = statistics.median(s["import"] for s in samples) * 1000
+    ready_ms = statistics.median(s["ready"] for s in samples) * 1000
+    print(f"Runs: {args.runs}, warm-up: {'on' if args.warm_up else 'off'}")
+    print(f"Import app.main: {import_ms:.1f}ms (median)")
+    print(f"Ready to serve:  {ready_ms:.1f}ms (median)")
+
+
+if __name__ == "__main__":
+    main()